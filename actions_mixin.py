@@ -1,35 +1,68 @@
 #!/usr/bin/env python3
+import itertools
 import os
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 import cv2
 from PyQt6.QtWidgets import QMessageBox
 
+from dialogs import cam_key
+from recorder import FrameRecorder
+
+CAPTURES_DIR = Path("captures")
+_capture_counter = itertools.count()
+
+
+JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 90, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+_io_pool: Optional[ThreadPoolExecutor] = None
+
+
+def io_pool() -> ThreadPoolExecutor:
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="capture-io")
+    return _io_pool
+
+
+def capture_stamp() -> str:
+    return time.strftime("%Y%m%d_%H%M%S") + f"_{next(_capture_counter):04d}"
+
+
+def write_jpeg(path, frame) -> bool:
+    ok, buf = cv2.imencode(".jpg", frame, JPEG_PARAMS)
+    if not ok:
+        return False
+    data = memoryview(buf)
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+    return True
+
 
 class CaptureActionsMixin:
     def _capture_from_cam(self, cam, label="capture"):
         if not cam:
             QMessageBox.information(self, "No Camera", "Select a camera first.")
             return
-        cap = self.capture_mgr.get(cam["index"] if isinstance(cam.get("index"), int) and cam.get("index") >= 0 else cam.get("path"))
-        if not cap or not cap.isOpened():
+        worker = self.capture_mgr.worker(cam)
+        if not worker or not worker.cap.isOpened():
             QMessageBox.warning(self, "Unavailable", "Camera not available.")
             return
-        try:
-            ret, frame = cap.read()
-        except Exception:
-            ret = False
-            frame = None
-        if not ret or frame is None:
-            QMessageBox.warning(self, "Unavailable", "Camera not available.")
+        frame = worker.still()
+        if frame is None:
+            QMessageBox.warning(self, "Unavailable", "Camera is not delivering frames.")
             return
-        Path("captures").mkdir(exist_ok=True)
-        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        path = Path("captures") / f"{label}_{stamp}.jpg"
+        stamp = capture_stamp()
+        path = CAPTURES_DIR / f"{label}_{stamp}.jpg"
         try:
-            cv2.imwrite(str(path), frame)
+            if not write_jpeg(path, frame):
+                raise OSError(path)
             QMessageBox.information(self, "Saved", f"Saved to:\n{path}")
         except Exception:
             QMessageBox.warning(self, "Error", "Could not save image.")
@@ -58,37 +91,39 @@ class CaptureActionsMixin:
             QMessageBox.information(self, "No Camera", "Select a main camera first.")
             self.main_record_btn.setChecked(False)
             return
+        fps = self.capture_mgr.fps(self.current_cam)
         self.recording = True
-        self.record_writer = None
         self.prev_gray = None
-        Path("captures").mkdir(exist_ok=True)
-        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.record_file = Path("captures") / f"record_{stamp}.mp4"
+        stamp = capture_stamp()
+        self.record_file = CAPTURES_DIR / f"record_{stamp}.mp4"
+        self.recorder = FrameRecorder(self.record_file, fps, maxsize=4)
+        self.recorder.start()
         self.main_record_btn.setText("Stop Recording")
 
     def stop_recording(self):
         self.recording = False
         self.main_record_btn.setChecked(False)
         self.main_record_btn.setText("Start Recording")
-        if self.record_writer:
-            try:
-                self.record_writer.release()
-            except Exception:
-                pass
-        self.record_writer = None
+        if self.recorder:
+            self.recorder.stop()
+        self.recorder = None
         self.record_file = None
 
     def start_corner_recording(self, idx: int):
         thumb = self.corner1 if idx == 1 else self.corner2
-        if not thumb.cam or not thumb.cap or not thumb.cap.isOpened():
+        worker = self.capture_mgr.worker(thumb.cam) if thumb.cam else None
+        if not worker or not worker.cap.isOpened():
             QMessageBox.information(self, "No Camera", f"Select corner camera {idx} first.")
             thumb.set_recording_active(False)
             return
-        Path("captures").mkdir(exist_ok=True)
-        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.corner_record_files[idx] = Path("captures") / f"record_corner{idx}_{stamp}.mp4"
-        fps = thumb.cap.get(cv2.CAP_PROP_FPS) or 20.0
-        self.corner_record_fps[idx] = fps if fps and fps >= 1 else 20.0
+        stamp = capture_stamp()
+        self.corner_record_files[idx] = CAPTURES_DIR / f"record_corner{idx}_{stamp}.mp4"
+        self.corner_record_fps[idx] = self.capture_mgr.fps(thumb.cam)
+        recorder = FrameRecorder(self.corner_record_files[idx], self.corner_record_fps[idx], self.settings.get("corner_record_size"))
+        recorder.start()
+        self._attach_corner_recorder(recorder, worker)
+        self.corner_record_keys[idx] = cam_key(thumb.cam)
+        self.corner_recorders[idx] = recorder
         self.corner_recording[idx] = True
         thumb.set_recording_active(True)
 
@@ -96,14 +131,34 @@ class CaptureActionsMixin:
         self.corner_recording[idx] = False
         thumb = self.corner1 if idx == 1 else self.corner2
         thumb.set_recording_active(False)
-        writer = self.corner_record_writers.get(idx)
-        if writer:
-            try:
-                writer.release()
-            except Exception:
-                pass
-        self.corner_record_writers[idx] = None
+        recorder = self.corner_recorders.get(idx)
+        if recorder:
+            recorder.stop()
+        self.corner_recorders[idx] = None
         self.corner_record_files[idx] = None
+        self.corner_record_keys[idx] = None
+
+    def _attach_corner_recorder(self, recorder, worker):
+        recorder.attach(worker)
+        # Queued back to the GUI thread, so a dropped worker updates the record button.
+        worker.signals.stopped.connect(self._sync_corner_recorders)
+
+    def _sync_corner_recorders(self):
+        # Corner recorders hang off a capture worker, not the thumbnail: follow the
+        # thumbnail to a new worker for the same camera, stop on anything else.
+        for idx, thumb in ((1, self.corner1), (2, self.corner2)):
+            recorder = self.corner_recorders.get(idx)
+            if recorder is None or not self.corner_recording.get(idx):
+                continue
+            if recorder.failed:
+                self.stop_corner_recording(idx)
+            elif recorder.source is thumb.worker and not recorder.source_lost:
+                continue
+            elif (thumb.worker is not None and thumb.worker is not recorder.source and thumb.cam
+                    and cam_key(thumb.cam) == self.corner_record_keys.get(idx)):
+                self._attach_corner_recorder(recorder, thumb.worker)
+            else:
+                self.stop_corner_recording(idx)
 
     def _toggle_corner_from_thumb(self, idx: int, state: bool):
         if state:
@@ -112,26 +167,9 @@ class CaptureActionsMixin:
             self.stop_corner_recording(idx)
 
     def _record_corner_frame(self, idx: int, frame):
+        # Frames reach the recorder from the capture thread; this only notices failures.
         if not self.corner_recording.get(idx):
             return
-        path = self.corner_record_files.get(idx)
-        if not path:
-            return
-        writer = self.corner_record_writers.get(idx)
-        if writer is None:
-            try:
-                h, w = frame.shape[:2]
-                fps = self.corner_record_fps.get(idx, 20.0) or 20.0
-                fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                writer = cv2.VideoWriter(str(path), fourcc, fps, (w, h))
-                if not writer or not writer.isOpened():
-                    self.stop_corner_recording(idx)
-                    return
-                self.corner_record_writers[idx] = writer
-            except Exception:
-                self.stop_corner_recording(idx)
-                return
-        try:
-            writer.write(frame)
-        except Exception:
+        recorder = self.corner_recorders.get(idx)
+        if recorder is not None and recorder.failed:
             self.stop_corner_recording(idx)
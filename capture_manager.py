@@ -1,59 +1,186 @@
 #!/usr/bin/env python3
 import contextlib
-import glob
 import os
-import re
+import struct
 import sys
-from typing import Any, Dict, List, Optional, Union
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import cv2
+from PyQt6.QtCore import QObject, pyqtSignal
 
+from preview import fit_size, scale_interpolation
 from settings_store import CAP_BACKEND
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# struct v4l2_capability: driver[16], card[32], bus_info[32], version,
+# capabilities, device_caps, reserved[3]
+_V4L2_CAPABILITY = struct.Struct("16s32s32sIII12x")
+VIDIOC_QUERYCAP = 0x80685600
+V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+V4L2_CAP_VIDEO_CAPTURE_MPLANE = 0x00001000
+V4L2_CAP_DEVICE_CAPS = 0x80000000
+
+
+def v4l2_querycap(path: str) -> Optional[Tuple[str, bool]]:
+    """Return (card name, is capture node) for a V4L2 node, or None if unknown."""
+    if fcntl is None:
+        return None
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+    except OSError:
+        return None
+    try:
+        buf = bytearray(_V4L2_CAPABILITY.size)
+        fcntl.ioctl(fd, VIDIOC_QUERYCAP, buf)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    _, card, _, _, caps, device_caps = _V4L2_CAPABILITY.unpack(buf)
+    if caps & V4L2_CAP_DEVICE_CAPS:
+        caps = device_caps
+    card = card.split(b"\0", 1)[0].decode("utf-8", "ignore").strip()
+    return card, bool(caps & (V4L2_CAP_VIDEO_CAPTURE | V4L2_CAP_VIDEO_CAPTURE_MPLANE))
+
+
+_DEVNULL_FD: Optional[int] = None
+_stderr_lock = threading.Lock()
+_stderr_depth = 0
+_stderr_saved: Optional[int] = None
+
 
 @contextlib.contextmanager
 def suppress_stderr():
-    with open(os.devnull, "w") as devnull:
-        old_fd = os.dup(2)
-        os.dup2(devnull.fileno(), 2)
+    global _DEVNULL_FD, _stderr_depth, _stderr_saved
+    with _stderr_lock:
+        if _stderr_depth == 0:
+            if _DEVNULL_FD is None:
+                _DEVNULL_FD = os.open(os.devnull, os.O_WRONLY)
+            _stderr_saved = os.dup(2)
+            os.dup2(_DEVNULL_FD, 2)
+        _stderr_depth += 1
+    try:
+        yield
+    finally:
+        with _stderr_lock:
+            _stderr_depth -= 1
+            if _stderr_depth == 0 and _stderr_saved is not None:
+                os.dup2(_stderr_saved, 2)
+                os.close(_stderr_saved)
+                _stderr_saved = None
+
+
+SYSFS_V4L = "/sys/class/video4linux"
+_VIDEO_PREFIX = "video"
+_scan_cache: Tuple[float, Optional[tuple], Optional[List[Dict[str, Any]]]] = (0.0, None, None)
+
+
+def _video_nodes() -> List[Tuple[int, os.DirEntry]]:
+    """Return (index, entry) for every /dev/videoN node, sorted by index."""
+    n = len(_VIDEO_PREFIX)
+    with os.scandir("/dev") as it:
+        nodes = [(int(e.name[n:]), e) for e in it if e.name.startswith(_VIDEO_PREFIX) and e.name[n:].isdigit()]
+    nodes.sort(key=lambda item: item[0])
+    return nodes
+
+
+def _scan_signature() -> Optional[tuple]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        sig = [os.stat("/dev").st_mtime_ns]
+        sig.extend((e.name, e.stat().st_mtime_ns) for _, e in _video_nodes())
         try:
-            yield
-        finally:
-            os.dup2(old_fd, 2)
-            os.close(old_fd)
+            sig.append(os.stat(SYSFS_V4L).st_mtime_ns)
+        except OSError:
+            pass
+        return tuple(sig)
+    except Exception:
+        return None
+
+
+def invalidate_scan_cache():
+    global _scan_cache
+    _scan_cache = (0.0, None, None)
+
+
+def scan_cameras(max_age: float = 2.0) -> List[Dict[str, Any]]:
+    global _scan_cache
+    stamp, sig, cached = _scan_cache
+    now = time.monotonic()
+    current = _scan_signature()
+    if cached is not None:
+        # A known device signature is authoritative; the age limit only covers
+        # platforms (and failures) where no signature is available.
+        if current is not None and current == sig:
+            return list(cached)
+        if current is None and sig is None and now - stamp < max_age:
+            return list(cached)
+    cams = _scan_cameras()
+    _scan_cache = (now, current, cams)
+    return list(cams)
+
+
+def _read_sysfs(path: str) -> str:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return ""
+    try:
+        return os.read(fd, 256).decode("utf-8", "ignore").strip()
+    except OSError:
+        return ""
+    finally:
+        os.close(fd)
 
 
-def scan_cameras() -> List[Dict[str, Any]]:
-    def scan_linux() -> List[Dict[str, Any]]:
+def _scan_cameras() -> List[Dict[str, Any]]:
+    def scan_linux() -> Optional[List[Dict[str, Any]]]:
         devices = {}
-        for node in sorted(glob.glob("/dev/video*")):
-            m = re.search(r"video(\d+)$", node)
-            if not m:
-                continue
-            try:
-                idx = int(m.group(1))
-            except Exception:
+        try:
+            entries = _video_nodes()
+        except OSError:
+            return None
+        try:
+            with os.scandir(SYSFS_V4L) as it:
+                sys_nodes = {e.name: e.path for e in it}
+        except OSError:
+            sys_nodes = {}
+        for idx, entry in entries:
+            node = entry.path
+            cap_info = v4l2_querycap(node)
+            if cap_info is not None and not cap_info[1]:
                 continue
 
-            sys_node = f"/sys/class/video4linux/video{idx}"
+            sys_node = sys_nodes.get(entry.name)
             parent = None
-            try:
-                device_link = os.path.join(sys_node, "device")
-                if os.path.exists(device_link):
-                    parent = os.path.realpath(device_link)
-            except Exception:
-                parent = None
-
-            name = node
-            name_file = os.path.join(sys_node, "name")
-            if os.path.exists(name_file):
-                with open(name_file, "r", encoding="utf-8", errors="ignore") as f:
-                    name = f.read().strip() or name
+            name = (cap_info[0] if cap_info else "") or node
+            if sys_node:
+                # A node without a device link resolves to its own unique path.
+                try:
+                    parent = os.path.realpath(sys_node + "/device")
+                except OSError:
+                    parent = None
+                name = _read_sysfs(sys_node + "/name") or name
 
-            key = parent if parent else os.path.realpath(node)
+            if parent:
+                key = parent
+            else:
+                try:
+                    key = entry.stat().st_ino
+                except OSError:
+                    key = node
             if key not in devices:
                 devices[key] = {
                     "index": idx,
+                    "key": f"/dev/video{idx}",
                     "path": node,
                     "name": name,
                     "display": f"{name} ({node})",
@@ -63,51 +190,257 @@ def scan_cameras() -> List[Dict[str, Any]]:
                 devices[key]["all_nodes"].append(idx)
                 if idx < devices[key]["index"]:
                     devices[key]["index"] = idx
+                    devices[key]["key"] = f"/dev/video{idx}"
                     devices[key]["path"] = node
                     devices[key]["display"] = f"{devices[key]['name']} ({node})"
         return sorted(devices.values(), key=lambda c: c.get("index", 9999))
 
     def probe_indices(max_devices: int = 10) -> List[Dict[str, Any]]:
         found = []
-        for idx in range(max_devices):
-            with suppress_stderr():
+        misses = 0
+        with suppress_stderr():
+            for idx in range(max_devices):
+                if misses >= 2:
+                    break
                 cap = None
                 try:
-                    cap = cv2.VideoCapture(idx)
+                    cap = cv2.VideoCapture(idx, CAP_BACKEND)
                 except Exception:
                     cap = None
-            if cap and cap.isOpened():
-                name = f"Camera {idx}"
-                found.append({
-                    "index": idx,
-                    "path": str(idx),
-                    "name": name,
-                    "display": f"{name} (index {idx})",
-                    "all_nodes": [idx]
-                })
-            try:
-                if cap:
-                    cap.release()
-            except Exception:
-                pass
+                if cap and cap.isOpened():
+                    name = f"Camera {idx}"
+                    found.append({
+                        "index": idx,
+                        "key": f"/dev/video{idx}",
+                        "path": str(idx),
+                        "name": name,
+                        "display": f"{name} (index {idx})",
+                        "all_nodes": [idx]
+                    })
+                    misses = 0
+                else:
+                    misses += 1
+                try:
+                    if cap:
+                        cap.release()
+                except Exception:
+                    pass
         return found
 
-    linux_cams = scan_linux() if sys.platform.startswith("linux") else []
-    if linux_cams:
-        return linux_cams
+    if sys.platform.startswith("linux"):
+        linux_cams = scan_linux()
+        if linux_cams is not None:
+            return linux_cams
     return probe_indices()
 
 
+class FrameSignals(QObject):
+    frame_ready = pyqtSignal()
+    stopped = pyqtSignal()
+
+
+def _opencl_ready() -> bool:
+    try:
+        return bool(cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL())
+    except Exception:
+        return False
+
+
+
+class CaptureWorker(threading.Thread):
+    IDLE_INTERVAL = 0.5
+    STALE_GRAB = 0.001
+    MAX_DRAIN = 4
+    FIRST_FRAME_WAIT = 1.0
+    STALE_FRAME = 2.0
+    # Shared by all workers; cleared for good once an OpenCL upload or resize fails.
+    use_opencl = _opencl_ready()
+
+    def __init__(self, cap: cv2.VideoCapture):
+        super().__init__(daemon=True)
+        self.cap = cap
+        self.signals = FrameSignals()
+        self.lock = threading.Lock()
+        self._frame_lock = threading.Lock()
+        self._frame = None
+        self._seq = 0
+        self._stamp = 0
+        self._has_frame = threading.Event()
+        self._running = True
+        self._intervals: Dict[Any, float] = {}
+        self._interval = self.IDLE_INTERVAL
+        self._views: Dict[Any, Tuple[int, int, bool]] = {}
+        self._scaled: Dict[Any, Any] = {}
+        self._notified = False
+        self._sinks: Dict[Any, Callable[[Any], Any]] = {}
+
+    def set_interval(self, owner: Any, seconds: Optional[float]):
+        with self._frame_lock:
+            if seconds is None:
+                self._intervals.pop(owner, None)
+                self._views.pop(owner, None)
+                self._scaled.pop(owner, None)
+            else:
+                self._intervals[owner] = seconds
+            self._interval = min(self._intervals.values(), default=self.IDLE_INTERVAL)
+
+    def set_view(self, owner: Any, box_w: int, box_h: int, smooth: bool = True):
+        """Also publish each frame pre-scaled to fit box_w x box_h for owner."""
+        with self._frame_lock:
+            self._views[owner] = (box_w, box_h, smooth)
+
+    def add_sink(self, owner: Any, fn: Callable[[Any], Any]):
+        """Call fn(frame) on the worker thread for every decoded frame."""
+        with self._frame_lock:
+            self._sinks[owner] = fn
+
+    def remove_sink(self, owner: Any):
+        with self._frame_lock:
+            self._sinks.pop(owner, None)
+
+    def view(self, owner: Any) -> Tuple[int, Any]:
+        with self._frame_lock:
+            return self._seq, self._scaled.get(owner)
+
+    def _scale_views(self, frame) -> Dict[Any, Any]:
+        with self._frame_lock:
+            views = list(self._views.items())
+        scaled: Dict[Any, Any] = {}
+        done: Dict[Tuple[int, int, bool], Any] = {}
+        if not views:
+            return scaled
+        h, w = frame.shape[:2]
+        src = frame
+        if CaptureWorker.use_opencl:
+            # Upload once and let the T-API run every resize on the GPU.
+            try:
+                src = cv2.UMat(frame)
+            except Exception:
+                CaptureWorker.use_opencl = False
+        for owner, spec in views:
+            box_w, box_h, smooth = spec
+            if box_w < 2 or box_h < 2:
+                continue
+            if spec not in done:
+                tw, th = fit_size(w, h, box_w, box_h)
+                interp = scale_interpolation(w, tw, smooth)
+                try:
+                    out = cv2.resize(src, (tw, th), interpolation=interp)
+                    done[spec] = out.get() if isinstance(out, cv2.UMat) else out
+                except Exception:
+                    done[spec] = None
+                    if src is not frame:
+                        CaptureWorker.use_opencl = False
+                        src = frame
+                        try:
+                            done[spec] = cv2.resize(frame, (tw, th), interpolation=interp)
+                        except Exception:
+                            pass
+            if done[spec] is not None:
+                scaled[owner] = done[spec]
+        return scaled
+
+    def run(self):
+        try:
+            self._loop()
+        finally:
+            # The worker owns the capture: releasing it here can never race a grab().
+            with self.lock:
+                try:
+                    self.cap.release()
+                except Exception:
+                    pass
+            self.signals.stopped.emit()
+
+    def _loop(self):
+        last = 0.0
+        drained = 0
+        while self._running:
+            frame = None
+            with self.lock:
+                try:
+                    t0 = time.perf_counter()
+                    ok = self.cap.grab()
+                    if ok and time.perf_counter() - t0 < self.STALE_GRAB and drained < self.MAX_DRAIN:
+                        drained += 1
+                    elif ok and time.monotonic() - last >= self._interval:
+                        drained = 0
+                        ok, frame = self.cap.retrieve()
+                        if frame is None:
+                            ok = False
+                except Exception:
+                    ok = False
+            if not ok:
+                # Keep publishing the last good frame; _stamp tells readers how old it is.
+                time.sleep(0.01)
+                continue
+            if frame is None:
+                continue
+            last = time.monotonic()
+            scaled = self._scale_views(frame)
+            with self._frame_lock:
+                self._frame = frame
+                self._scaled = scaled
+                self._seq += 1
+                self._stamp = time.monotonic_ns()
+                # Coalesce: no new frame_ready until someone has fetched the last one.
+                notify = not self._notified
+                self._notified = True
+                sinks = list(self._sinks.values())
+            self._has_frame.set()
+            for fn in sinks:
+                try:
+                    fn(frame)
+                except Exception:
+                    pass
+            if notify:
+                self.signals.frame_ready.emit()
+
+    def still(self):
+        """Frame for a still capture: waits briefly for the first one and rejects stale ones."""
+        self._has_frame.wait(self.FIRST_FRAME_WAIT)
+        with self._frame_lock:
+            frame, stamp = self._frame, self._stamp
+        if frame is None or time.monotonic_ns() - stamp > self.STALE_FRAME * 1e9:
+            return None
+        return frame
+
+    def fetch(self) -> Tuple[int, Any]:
+        with self._frame_lock:
+            self._notified = False
+            return self._seq, self._frame
+
+    def stop(self, wait: bool = True):
+        self._running = False
+        if wait and self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout=1.0)
+
+
 class CaptureManager:
-    def __init__(self):
+    def __init__(self, fourcc: Optional[str] = None, fourcc_overrides: Optional[Dict[str, str]] = None):
+        self.fourcc = fourcc
+        self.fourcc_overrides: Dict[str, str] = dict(fourcc_overrides or {})
         self.captures: Dict[str, cv2.VideoCapture] = {}
+        self.workers: Dict[str, CaptureWorker] = {}
+        self.resolutions: Dict[str, Tuple[int, int]] = {}
+        self._fps: Dict[str, float] = {}
+        self._keys: Dict[Union[int, str, None], str] = {}
+        self._lock = threading.Lock()
+
+    def _target(self, src: Union[int, str, Dict[str, Any]]) -> Union[int, str, None]:
+        if isinstance(src, dict):
+            idx = src.get("index")
+            return idx if isinstance(idx, int) and idx >= 0 else src.get("path")
+        return src
 
     def _key(self, src: Union[int, str, Dict[str, Any]]) -> str:
         if isinstance(src, dict):
-            return str(src.get("path") or src.get("index"))
-        if isinstance(src, int):
-            return f"/dev/video{src}"
-        return str(src)
+            return src.get("key") or self._key(self._target(src))
+        key = self._keys.get(src)
+        if key is None:
+            key = f"/dev/video{src}" if isinstance(src, int) else str(src)
+            self._keys[src] = key
+        return key
 
     def _open(self, src: Union[int, str, None]) -> Optional[cv2.VideoCapture]:
         if src is None:
@@ -118,6 +451,12 @@ class CaptureManager:
             except Exception:
                 cap = None
         if cap and cap.isOpened():
+            fourcc = self.fourcc_overrides.get(self._key(src), self.fourcc)
+            if fourcc and len(fourcc) == 4:
+                try:
+                    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+                except Exception:
+                    pass
             try:
                 cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             except Exception:
@@ -130,50 +469,140 @@ class CaptureManager:
                 pass
         return None
 
-    def open_all(self, cams: List[Dict[str, Any]]):
+    def _targets(self, cams: List[Dict[str, Any]]) -> Dict[str, Union[int, str]]:
+        targets: Dict[str, Union[int, str]] = {}
         for cam in cams:
-            idx = cam.get("index")
-            target = idx if isinstance(idx, int) and idx >= 0 else cam.get("path")
-            key = self._key(target)
-            if key not in self.captures:
+            targets.setdefault(self._key(cam), self._target(cam))
+        return targets
+
+    # _lock guards captures/workers; the slow opens themselves run outside it, and
+    # _store settles a race where two threads opened the same camera.
+    def prune(self, cams: List[Dict[str, Any]]):
+        keep = self._targets(cams)
+        with self._lock:
+            stale = [k for k in self.captures if k not in keep]
+        for key in stale:
+            self._drop(key)
+
+    def open_all(self, cams: List[Dict[str, Any]]):
+        wanted = self._targets(cams)
+        with self._lock:
+            targets = {k: t for k, t in wanted.items() if k not in self.captures}
+        if not targets:
+            return
+        with suppress_stderr():
+            if len(targets) == 1:
+                key, target = next(iter(targets.items()))
                 cap = self._open(target)
                 if cap:
-                    self.captures[key] = cap
+                    self._store(key, cap)
+                return
+            with ThreadPoolExecutor(max_workers=len(targets)) as ex:
+                futures = {ex.submit(self._open, target): key for key, target in targets.items()}
+                for future in as_completed(futures):
+                    cap = future.result()
+                    if cap:
+                        self._store(futures[future], cap)
 
-    def get(self, src: Union[int, str, Dict[str, Any]]) -> Optional[cv2.VideoCapture]:
-        key = self._key(src)
-        cap = self.captures.get(key)
-        if cap and cap.isOpened():
-            return cap
-        if cap:
+    def _store(self, key: str, cap: cv2.VideoCapture) -> cv2.VideoCapture:
+        """Register cap under key unless a live capture already holds it; returns the one in use."""
+        with self._lock:
+            current = self.workers.get(key)
+            if current is None or not current.is_alive():
+                worker = CaptureWorker(cap)
+                self.captures[key] = cap
+                self.workers[key] = worker
+                worker.start()
+                return cap
+            kept = self.captures[key]
+        try:
+            cap.release()
+        except Exception:
+            pass
+        return kept
+
+    def _drop(self, key: str):
+        with self._lock:
+            self.resolutions.pop(key, None)
+            self._fps.pop(key, None)
+            worker = self.workers.pop(key, None)
+            cap = self.captures.pop(key, None)
+        if worker:
+            # A worker stalled in grab() past the join timeout releases on its way out.
+            worker.stop()
+        elif cap:
             try:
                 cap.release()
             except Exception:
                 pass
-            self.captures.pop(key, None)
 
-        if isinstance(src, dict):
-            idx = src.get("index")
-            target = idx if isinstance(idx, int) and idx >= 0 else src.get("path")
-        else:
-            target = src
-        cap = self._open(target)
+    def get(self, src: Union[int, str, Dict[str, Any]]) -> Optional[cv2.VideoCapture]:
+        key = self._key(src)
+        with self._lock:
+            cap = self.captures.get(key)
+        if cap and cap.isOpened():
+            return cap
         if cap:
-            self.captures[key] = cap
-        return cap
+            self._drop(key)
 
-    def release(self, src: Union[int, str]):
-        cap = self.captures.pop(self._key(src), None)
+        cap = self._open(self._target(src))
         if cap:
+            return self._store(key, cap)
+        with self._lock:
+            # A concurrent open may have won the device.
+            return self.captures.get(key)
+
+    def worker(self, src: Union[int, str, Dict[str, Any]]) -> Optional[CaptureWorker]:
+        if self.get(src) is None:
+            return None
+        return self.workers.get(self._key(src))
+
+    def still(self, src: Union[int, str, Dict[str, Any]]):
+        worker = self.worker(src)
+        return worker.still() if worker else None
+
+    def set_resolution(self, src: Union[int, str, Dict[str, Any]], w: int, h: int):
+        cap = self.get(src)
+        if not cap:
+            return
+        key = self._key(src)
+        if self.resolutions.get(key) == (w, h):
+            return
+        worker = self.workers.get(key)
+        with worker.lock if worker else contextlib.nullcontext():
             try:
-                cap.release()
+                cur = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+                if cur != (w, h):
+                    cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
+                    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
+                self.resolutions[key] = (w, h)
             except Exception:
                 pass
+        self._fps.pop(key, None)
+
+    def fps(self, src: Union[int, str, Dict[str, Any]], default: float = 20.0) -> float:
+        key = self._key(src)
+        fps = self._fps.get(key)
+        if fps is None:
+            worker = self.workers.get(key)
+            if worker is None:
+                return default
+            with worker.lock:
+                try:
+                    fps = float(worker.cap.get(cv2.CAP_PROP_FPS) or 0.0)
+                except Exception:
+                    fps = 0.0
+            self._fps[key] = fps
+        return fps if fps >= 1 else default
+
+    def release(self, src: Union[int, str]):
+        self._drop(self._key(src))
 
     def release_all(self):
-        for cap in self.captures.values():
-            try:
-                cap.release()
-            except Exception:
-                pass
-        self.captures.clear()
+        with self._lock:
+            workers = list(self.workers.values())
+            keys = list(self.captures)
+        for worker in workers:
+            worker.stop(wait=False)
+        for key in keys:
+            self._drop(key)
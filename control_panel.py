@@ -14,14 +14,30 @@ from PyQt6.QtWidgets import (
 )
 
 
+LIST_VIEW_QSS = (
+    "QListView{background:#0b1220; color:#e6eef8; border:1px solid #1f2937; padding:0; margin:0;}"
+    "QListView::item{padding:10px 12px; margin:0; background:#0b1220; border:0;}"
+    "QListView::item:selected{background:#1e3a8a; color:#fff; border:0;}"
+    "QListView::item:hover{background:#111827; color:#fff;}"
+)
+
+CONTROL_QSS = """
+    QWidget#controlPanel {background:#0b1220; color:#e6eef8; border:1px solid #1f2937; border-radius:12px;}
+    QLabel {font-size:13px; color:#e6eef8; background:transparent;}
+    QPushButton {background:#1e3a8a; color:#fff; padding:10px 14px; border:none; border-radius:8px; font-weight:600;}
+    QPushButton:checked {background:#2563eb;}
+    QComboBox {background:#0b1220; color:#e6eef8; padding:8px 10px; border:1px solid #1f2937; border-radius:8px;}
+    QComboBox::drop-down {border: none;}
+    QComboBox QAbstractItemView {background:#0b1220; color:#e6eef8; selection-background-color:#1e3a8a; selection-color:#fff; border:1px solid #1f2937; outline:0; padding:0; margin:0;}
+    QComboBox QAbstractItemView::item {padding:10px 12px; margin:0; background:#0b1220; border:0;}
+    QComboBox QAbstractItemView::item:selected {background:#1e3a8a; color:#fff; border:0;}
+    QComboBox QAbstractItemView::item:hover {background:#111827; color:#fff;}
+"""
+
+
 def styled_list_view() -> QListView:
     lv = QListView()
-    lv.setStyleSheet(
-        "QListView{background:#0b1220; color:#e6eef8; border:1px solid #1f2937; padding:0; margin:0;}"
-        "QListView::item{padding:10px 12px; margin:0; background:#0b1220; border:0;}"
-        "QListView::item:selected{background:#1e3a8a; color:#fff; border:0;}"
-        "QListView::item:hover{background:#111827; color:#fff;}"
-    )
+    lv.setStyleSheet(LIST_VIEW_QSS)
     return lv
 
 
@@ -29,18 +45,7 @@ def build_control_panel(app: Any) -> QWidget:
     panel = QWidget(app, Qt.WindowType.Tool)
     panel.setWindowTitle("MyEye - Control Panel")
     panel.setWindowFlags(panel.windowFlags() | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.FramelessWindowHint)
-    panel.setStyleSheet("""
-        QWidget#controlPanel {background:#0b1220; color:#e6eef8; border:1px solid #1f2937; border-radius:12px;}
-        QLabel {font-size:13px; color:#e6eef8; background:transparent;}
-        QPushButton {background:#1e3a8a; color:#fff; padding:10px 14px; border:none; border-radius:8px; font-weight:600;}
-        QPushButton:checked {background:#2563eb;}
-        QComboBox {background:#0b1220; color:#e6eef8; padding:8px 10px; border:1px solid #1f2937; border-radius:8px;}
-        QComboBox::drop-down {border: none;}
-        QComboBox QAbstractItemView {background:#0b1220; color:#e6eef8; selection-background-color:#1e3a8a; selection-color:#fff; border:1px solid #1f2937; outline:0; padding:0; margin:0;}
-        QComboBox QAbstractItemView::item {padding:10px 12px; margin:0; background:#0b1220; border:0;}
-        QComboBox QAbstractItemView::item:selected {background:#1e3a8a; color:#fff; border:0;}
-        QComboBox QAbstractItemView::item:hover {background:#111827; color:#fff;}
-    """)
+    panel.setStyleSheet(CONTROL_QSS)
     panel.setObjectName("controlPanel")
     panel.setMinimumWidth(520)
 
@@ -56,7 +61,7 @@ def build_control_panel(app: Any) -> QWidget:
         b.setParent(panel)
         b.setMinimumHeight(44)
         b.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-    for cb in (app.main_sel, app.c1_sel, app.c2_sel, app.fs_combo, app.res_sel):
+    for cb in (app.main_sel, app.c1_sel, app.c2_sel, app.fs_combo, app.res_sel, app.fmt_sel):
         cb.setParent(panel)
         cb.setMinimumHeight(38)
 
@@ -85,6 +90,8 @@ def build_control_panel(app: Any) -> QWidget:
     row_misc.addWidget(QLabel("Resolution", panel))
     row_misc.addWidget(app.res_sel)
     row_misc.addWidget(app.res_apply)
+    row_misc.addWidget(QLabel("Format", panel))
+    row_misc.addWidget(app.fmt_sel)
     row_misc.addWidget(app.fs_combo)
     row_misc.addWidget(app.fs_btn)
 
@@ -15,12 +15,32 @@ from PyQt6.QtWidgets import (
 )
 
 
+def cam_key(cam):
+    if not cam:
+        return None
+    path = cam.get("path")
+    return path if path is not None else cam.get("index")
+
+
 def populate_combo(combo: QComboBox, cams, include_none=True):
-    combo.clear()
-    if include_none:
-        combo.addItem("None", None)
-    for c in cams:
-        combo.addItem(c["display"], c)
+    # Refill silently in one repaint; callers pick the index afterwards.
+    blocked = combo.blockSignals(True)
+    combo.setUpdatesEnabled(False)
+    keys = {}
+    try:
+        combo.clear()
+        if include_none:
+            combo.addItem("None", None)
+            keys[None] = 0
+        for c in cams:
+            keys.setdefault(cam_key(c), combo.count())
+            combo.addItem(c["display"], c)
+    finally:
+        combo.setUpdatesEnabled(True)
+        combo.blockSignals(blocked)
+    # key -> first item index, so selectors can be restored without scanning
+    combo.key_index = keys
+    return keys
 
 
 class CameraConfigDialog(QDialog):
@@ -2,7 +2,7 @@
 import os
 from typing import Optional, Union
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import (
     QDialog,
     QDialogButtonBox,
@@ -20,17 +20,27 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-import cv2
+from actions_mixin import capture_stamp, io_pool, write_jpeg
 from capture_manager import scan_cameras
 from dialogs import CameraConfigDialog
-from settings_store import save_settings
+
+CAPTURE_QSS = (
+    "QDialog{background:#0b1220; color:#e6eef8;}"
+    "QLabel{color:#e6eef8;}"
+    "QCheckBox{color:#e6eef8;}"
+    "QLineEdit{background:#0f172a; color:#e6eef8; border:1px solid #1f2937; border-radius:6px; padding:6px;}"
+    "QPushButton{background:#1e3a8a; color:#fff; padding:10px 14px; border:none; border-radius:8px; font-weight:600;}"
+    "QPushButton:pressed{background:#2563eb;}"
+    "QScrollArea{background:#0b1220; border:1px solid #1f2937; border-radius:8px;}"
+    "QScrollArea QWidget{background:#0b1220;}"
+    "QDialogButtonBox QPushButton{min-height:36px;}"
+)
 
 
 class DialogsMixin:
     def open_camera_config(self):
         self._hide_controls_panel_for_dialog()
         with self._paused_streams():
-            self.capture_mgr.release_all()
             self.cams = scan_cameras()
             cur = {"main": self.settings.get("main"), "main_path": self.settings.get("main_path"),
                    "corner1": self.settings.get("corner1"), "corner1_path": self.settings.get("corner1_path"),
@@ -43,7 +53,7 @@ class DialogsMixin:
                 for k in ("main", "main_path", "corner1", "corner1_path", "corner2", "corner2_path", "resolution"):
                     self.settings[k] = sel.get(k, self.settings.get(k))
                 self.apply_settings()
-                save_settings(self.settings)
+                self._save_timer.start()
         self._restore_controls_panel_after_dialog()
 
     def open_resolution(self):
@@ -66,32 +76,35 @@ class DialogsMixin:
             if it:
                 self.settings["resolution"] = it.data(Qt.ItemDataRole.UserRole)
                 if self.current_cam:
-                    cap = self.capture_mgr.get(self.current_cam["index"] if isinstance(self.current_cam.get("index"), int) and self.current_cam.get("index") >= 0 else self.current_cam.get("path"))
-                    if cap:
-                        try:
-                            w, h = tuple(self.settings["resolution"])
-                            cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
-                            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
-                        except Exception:
-                            pass
-                save_settings(self.settings)
+                    w, h = tuple(self.settings["resolution"])
+                    self.capture_mgr.set_resolution(self.current_cam, w, h)
+                self._save_timer.start()
         self._restore_controls_panel_after_dialog()
 
+    def _check_capture_write(self, fut, path):
+        # Runs on the I/O thread; the signal hands failures back to the GUI thread.
+        try:
+            ok = fut.result()
+        except Exception:
+            ok = False
+        if not ok:
+            self.capture_write_failed.emit(str(path))
+
+    def _on_capture_write_failed(self, path: str):
+        if not self._failed_writes:
+            # Let the rest of the batch finish so one warning covers it.
+            QTimer.singleShot(200, self._report_failed_writes)
+        self._failed_writes.append(path)
+
+    def _report_failed_writes(self):
+        paths, self._failed_writes = self._failed_writes, []
+        QMessageBox.warning(self, "Error", "Could not save:\n" + "\n".join(paths))
+
     def capture_dialog(self):
         cams = self.cams or scan_cameras()
         dlg = QDialog(self)
         dlg.setWindowTitle("Capture")
-        dlg.setStyleSheet(
-            "QDialog{background:#0b1220; color:#e6eef8;}"
-            "QLabel{color:#e6eef8;}"
-            "QCheckBox{color:#e6eef8;}"
-            "QLineEdit{background:#0f172a; color:#e6eef8; border:1px solid #1f2937; border-radius:6px; padding:6px;}"
-            "QPushButton{background:#1e3a8a; color:#fff; padding:10px 14px; border:none; border-radius:8px; font-weight:600;}"
-            "QPushButton:pressed{background:#2563eb;}"
-            "QScrollArea{background:#0b1220; border:1px solid #1f2937; border-radius:8px;}"
-            "QScrollArea QWidget{background:#0b1220;}"
-            "QDialogButtonBox QPushButton{min-height:36px;}"
-        )
+        dlg.setStyleSheet(CAPTURE_QSS)
         v = QVBoxLayout(dlg)
         scroll = QScrollArea()
         w = QWidget()
@@ -123,22 +136,20 @@ class DialogsMixin:
         if dlg.exec() == QDialog.DialogCode.Accepted:
             folder = pe.text() or "captures"
             os.makedirs(folder, exist_ok=True)
+            pool = io_pool()
+            skipped = []
             for cb in checks:
                 if cb.isChecked():
                     cam = cb.property("cam")
-                    cap = self.capture_mgr.get(cam["index"] if isinstance(cam.get("index"), int) and cam.get("index") >= 0 else cam.get("path"))
-                    if not cap:
-                        continue
-                    try:
-                        ret, frame = cap.read()
-                    except Exception:
-                        ret = False
-                        frame = None
-                    if not ret or frame is None:
+                    frame = self.capture_mgr.still(cam)
+                    if frame is None:
+                        skipped.append(cam["display"])
                         continue
-                    path = os.path.join(folder, f"capture_{cam['index'] if cam.get('index') is not None else 'unk'}_{cv2.getTickCount()}.jpg")
-                    try:
-                        cv2.imwrite(path, frame)
-                    except Exception:
-                        pass
-            QMessageBox.information(self, "Saved", f"Saved captures to:\n{folder}")
+                    path = os.path.join(folder, f"capture_{cam['index'] if cam.get('index') is not None else 'unk'}_{capture_stamp()}.jpg")
+                    # Worker frames are never written to after publishing, so no copy is needed.
+                    pool.submit(write_jpeg, path, frame).add_done_callback(
+                        lambda fut, path=path: self._check_capture_write(fut, path))
+            if skipped:
+                QMessageBox.warning(self, "Saved", f"Saved captures to:\n{folder}\n\nNo frame from:\n" + "\n".join(skipped))
+            else:
+                QMessageBox.information(self, "Saved", f"Saved captures to:\n{folder}")
@@ -1,9 +1,94 @@
 #!/usr/bin/env python3
 from typing import Any
 
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QImage, QPixmap
-from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout
+from PyQt6.QtCore import Qt, QEvent
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+
+from preview import PreviewBuffer
+from widgets import VideoView
+
+
+class FullscreenViewer(QWidget):
+    # Parentless windows are owned by Python; keep each one alive until it closes.
+    _open = set()
+
+    def __init__(self, worker, title: str, smooth: bool = False):
+        super().__init__()
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.setWindowTitle(title)
+        self.resize(960, 720)
+        self.lbl = VideoView(self)
+        self.lbl.setStyleSheet("background:#000;")
+        self.lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.lbl)
+        self.worker = worker
+        self.cap = worker.cap
+        self.smooth = smooth
+        self._preview = PreviewBuffer()
+        self._last = -1
+        self._connected = True
+        FullscreenViewer._open.add(self)
+        worker.set_interval(self, 0.0)
+        worker.signals.frame_ready.connect(self._tick)
+        worker.signals.stopped.connect(self._on_stopped)
+
+    def _cleanup(self):
+        if not self._connected:
+            return
+        self._connected = False
+        signals = self.worker.signals
+        self.worker.set_interval(self, None)
+        for signal, slot in ((signals.frame_ready, self._tick), (signals.stopped, self._on_stopped)):
+            try:
+                signal.disconnect(slot)
+            except Exception:
+                pass
+        FullscreenViewer._open.discard(self)
+
+    def _on_stopped(self):
+        self._cleanup()
+        self.close()
+
+    def _tick(self):
+        if not self._connected:
+            return
+        if not self.cap or not self.cap.isOpened():
+            self._on_stopped()
+            return
+        seq, frame = self.worker.fetch()
+        if frame is None or seq == self._last:
+            return
+        self._last = seq
+        if self.isMinimized():
+            return
+        lbl = self.lbl
+        w, h = lbl.width(), lbl.height()
+        self.worker.set_view(self, w, h, self.smooth)
+        _, view = self.worker.view(self)
+        rendered = self._preview.render_image(frame if view is None else view, w, h, self.smooth)
+        if rendered is not None:
+            lbl.set_image(*rendered)
+
+    def showEvent(self, ev):
+        super().showEvent(ev)
+        self._tick()
+
+    def keyPressEvent(self, ev):
+        if ev.key() == Qt.Key.Key_Escape:
+            self.close()
+        else:
+            super().keyPressEvent(ev)
+
+    def closeEvent(self, ev):
+        self._cleanup()
+        super().closeEvent(ev)
+
+    def changeEvent(self, ev):
+        if ev.type() == QEvent.Type.WindowStateChange and self._connected:
+            self.worker.set_interval(self, None if self.isMinimized() else 0.0)
+        super().changeEvent(ev)
 
 
 class FullscreenMixin:
@@ -20,71 +105,19 @@ class FullscreenMixin:
         self.open_fullscreen(idx, name)
 
     def open_fullscreen(self, index, name):
-        cap = None
+        worker = None
         if isinstance(index, int) and index >= 0:
-            cap = self.capture_mgr.get(index)
+            worker = self.capture_mgr.worker(index)
 
-        if not cap:
+        if not worker:
             for c in self.cams:
                 if c.get("name") == name:
-                    cap = self.capture_mgr.get(c["index"])
+                    worker = self.capture_mgr.worker(c)
                     break
 
-        if not cap:
+        if not worker:
             from PyQt6.QtWidgets import QMessageBox
             QMessageBox.warning(self, "Unavailable", "Camera not available.")
             return
 
-        fs = QWidget()
-        fs.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
-        fs.setWindowTitle(name)
-        fs.resize(960, 720)
-        lbl = QLabel(fs)
-        lbl.setStyleSheet("background:#000;")
-        lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout = QVBoxLayout(fs)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(lbl)
-        fs.show()
-
-        timer = QTimer(fs)
-
-        def cleanup():
-            try:
-                if timer.isActive():
-                    timer.stop()
-            except Exception:
-                pass
-
-        def tick():
-            if not cap or not cap.isOpened():
-                cleanup()
-                fs.close()
-                return
-            ret, frame = cap.read()
-            if not ret or frame is None:
-                return
-            rgb = self._frame_to_rgb(frame)
-            if rgb is None:
-                return
-            h, w, _ = rgb.shape
-            q = QImage(rgb.data, w, h, 3 * w, QImage.Format.Format_RGB888)
-            p = QPixmap.fromImage(q)
-            lbl.setPixmap(p.scaled(lbl.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
-
-        timer.timeout.connect(tick)
-        timer.start(30)
-
-        def keyPressEvent(ev):
-            if ev.key() == Qt.Key.Key_Escape:
-                fs.close()
-            else:
-                QWidget.keyPressEvent(fs, ev)
-
-        def closeEvent(ev):
-            cleanup()
-            QWidget.closeEvent(fs, ev)
-
-        fs.keyPressEvent = keyPressEvent
-        fs.closeEvent = closeEvent
-        fs.destroyed.connect(lambda *_: cleanup())
+        FullscreenViewer(worker, name, bool(self.settings.get("smooth_scaling"))).show()
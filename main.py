@@ -4,10 +4,13 @@ import sys
 from PyQt6.QtWidgets import QApplication
 
 from main_window import CameraApp
+from recorder import configure_hw_encoder
 
 
 def main():
     qt_app = QApplication(sys.argv)
+    # Before CameraApp starts any capture thread: this may set a process-wide env var.
+    configure_hw_encoder()
     window = CameraApp()
     window.showFullScreen()
     sys.exit(qt_app.exec())
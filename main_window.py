@@ -1,42 +1,74 @@
 #!/usr/bin/env python3
 import os
 import contextlib
-from datetime import datetime
+import threading
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 import cv2
-from PyQt6.QtCore import Qt, QTimer, QPoint
-from PyQt6.QtGui import QImage, QPixmap
+import numpy as np
+from PyQt6.QtCore import Qt, QEvent, QTimer, QPoint, pyqtSignal
+from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import (
     QWidget, QLabel, QVBoxLayout, QHBoxLayout,
     QPushButton, QComboBox, QMessageBox, QSizePolicy
 )
 
-from capture_manager import CaptureManager, scan_cameras
+from capture_manager import CaptureManager, invalidate_scan_cache, scan_cameras
 from settings_store import load_settings, save_settings
-from widgets import CameraThumbnail
+from preview import PreviewBuffer
+from widgets import CAPTURE_BTN_QSS, DETACH_BTN_QSS, RECORD_BTN_QSS, CameraThumbnail, VideoView
 from control_panel import styled_list_view
 from dialogs import populate_combo
-from actions_mixin import CaptureActionsMixin
+from actions_mixin import CAPTURES_DIR, CaptureActionsMixin
 from fullscreen_mixin import FullscreenMixin
 from panel_mixin import PanelMixin
 from dialogs_mixin import DialogsMixin
 
+MAIN_DECODE_INTERVAL = 0.024
+# The main preview is driven by frame_ready; the timer only gates it and re-resolves the worker.
+MAIN_WATCHDOG_MS = 250
+MOTION_SIZE = (160, 120)
+# Motion means this many changed source pixels, whatever the camera resolution.
+MOTION_PIXELS = 5000
+
+MOTION_IDLE_QSS = "background:#6366f1; color:#fff; padding:3px 6px; border-radius:4px;"
+MOTION_ON_QSS = "background:#d32f2f; color:#fff; padding:3px 6px; border-radius:4px;"
+MOTION_OFF_QSS = "background:#444; color:#fff; padding:3px 6px; border-radius:4px;"
+
 
 class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, DialogsMixin):
+    cameras_scanned = pyqtSignal()
+    capture_write_failed = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
+        self._overlays_sized = False
+        self._layout_timer = QTimer(self)
+        self._layout_timer.setSingleShot(True)
+        self._layout_timer.setInterval(16)
+        self._layout_timer.timeout.connect(self._layout_overlays)
         self.setWindowTitle("LoCam")
         self.setMinimumSize(1100, 650)
         self.setStyleSheet("background:#000;")
         self.setWindowFlags(self.windowFlags() | Qt.WindowType.FramelessWindowHint)
         self._drag_pos = None
         self.settings = load_settings()
-        self.capture_mgr = CaptureManager()
+        try:
+            CAPTURES_DIR.mkdir(exist_ok=True)
+        except Exception:
+            pass
+        self.capture_mgr = CaptureManager(
+            fourcc=self.settings.get("fourcc"),
+            fourcc_overrides=self.settings.get("camera_fourcc"),
+        )
         self.cams: List[Dict[str, Any]] = []
         self.current_cam = None
-        self.video_label = QLabel("Live Preview")
+        self._last_seq = -1
+        self._main_worker = None
+        self._preview = PreviewBuffer()
+        self._smooth = bool(self.settings.get("smooth_scaling"))
+        self.video_label = VideoView("Live Preview")
         self.video_label.setStyleSheet("background:qlineargradient(x1:0,y1:0,x2:1,y2:1,stop:0 #0f172a, stop:1 #111827); color:#e6eef8; font-size:16px; border:1px solid #1f2937; border-radius:8px;")
         self.video_label.setMinimumSize(640, 480)
         self.video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -47,9 +79,10 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
         self.main_overlay.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
         self.main_overlay.hide()
         self.motion_indicator = QLabel("Motion", self.video_label)
-        self.motion_indicator.setStyleSheet("background:#6366f1; color:#fff; padding:3px 6px; border-radius:4px;")
+        self.motion_indicator.setStyleSheet(MOTION_IDLE_QSS)
         self.motion_indicator.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
         self.motion_indicator.hide()
+        self._motion_shown = None
         self.logo_label = QLabel(self.video_label)
         self.logo_label.setFixedSize(88, 88)
         self.logo_label.setStyleSheet("background:transparent; border:1px dashed #1f2937; border-radius:44px;")
@@ -66,27 +99,27 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
         self.main_detach_btn = QPushButton("Separate Window", self.video_label)
         self.main_detach_btn.setMinimumHeight(30)
         self.main_detach_btn.setMinimumWidth(200)
-        self.main_detach_btn.setStyleSheet("QPushButton{background:#1e88e5;color:#fff;border:none;border-radius:3px;} QPushButton:pressed{background:#166bb0;}")
+        self.main_detach_btn.setStyleSheet(DETACH_BTN_QSS)
         self.main_detach_btn.clicked.connect(self.detach_main_fullscreen)
         self.main_detach_btn.hide()
         self.main_capture_btn = QPushButton("Take Picture", self.video_label)
         self.main_capture_btn.setMinimumHeight(30)
         self.main_capture_btn.setMinimumWidth(160)
-        self.main_capture_btn.setStyleSheet("QPushButton{background:#0ea5e9;color:#fff;border:none;border-radius:3px;} QPushButton:pressed{background:#0284c7;}")
+        self.main_capture_btn.setStyleSheet(CAPTURE_BTN_QSS)
         self.main_capture_btn.clicked.connect(self._capture_main)
         self.main_capture_btn.hide()
         self.main_record_btn = QPushButton("Start Recording", self.video_label)
         self.main_record_btn.setCheckable(True)
         self.main_record_btn.setMinimumHeight(30)
         self.main_record_btn.setMinimumWidth(160)
-        self.main_record_btn.setStyleSheet("QPushButton{background:#16a34a;color:#fff;border:none;border-radius:3px;} QPushButton:pressed{background:#15803d;} QPushButton:checked{background:#b91c1c;}")
+        self.main_record_btn.setStyleSheet(RECORD_BTN_QSS)
         self.main_record_btn.clicked.connect(self.toggle_recording)
         self.main_record_btn.hide()
 
         self.corner1 = CameraThumbnail("Corner Cam 1")
         self.corner2 = CameraThumbnail("Corner Cam 2")
         self.refresh_btn = QPushButton("🔄 Refresh")
-        self.refresh_btn.clicked.connect(self.refresh_cameras)
+        self.refresh_btn.clicked.connect(lambda: self._start_camera_scan(rescan=True))
         self.motion_btn = QPushButton("Motion Detect")
         self.motion_btn.setCheckable(True)
         self.motion_btn.clicked.connect(self.toggle_motion)
@@ -102,13 +135,17 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
         for r in [(640, 480), (1280, 720), (1920, 1080)]:
             self.res_sel.addItem(f"{r[0]} x {r[1]}", r)
         self.res_apply = QPushButton("Apply Resolution")
-        for combo in (self.main_sel, self.c1_sel, self.c2_sel, self.fs_combo, self.res_sel):
+        self.fmt_sel = QComboBox()
+        for label, fourcc in (("MJPG", "MJPG"), ("YUYV", "YUYV"), ("Driver default", "")):
+            self.fmt_sel.addItem(label, fourcc)
+        for combo in (self.main_sel, self.c1_sel, self.c2_sel, self.fs_combo, self.res_sel, self.fmt_sel):
             combo.setMinimumWidth(140)
             combo.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
             combo.setView(styled_list_view())
         self.main_sel.currentIndexChanged.connect(lambda _: self._select_slot("main", self.main_sel))
         self.c1_sel.currentIndexChanged.connect(lambda _: self._select_slot("corner1", self.c1_sel))
         self.c2_sel.currentIndexChanged.connect(lambda _: self._select_slot("corner2", self.c2_sel))
+        self.fmt_sel.currentIndexChanged.connect(lambda _: self._apply_format_from_panel())
         self._selectors_updating = False
         self.close_btn = QPushButton("✕")
         self.close_btn.setParent(self)
@@ -121,7 +158,12 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
         self.controls_panel = None
         self._panel_was_visible = False
         self.pending_settings = dict(self.settings)
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(250)
+        self._save_timer.timeout.connect(lambda: save_settings(self.settings))
         self.timer = QTimer()
+        self.timer.setInterval(MAIN_WATCHDOG_MS)
         self.timer.timeout.connect(self.update_frame)
         self.corner1.clicked.connect(self.open_fullscreen)
         self.corner2.clicked.connect(self.open_fullscreen)
@@ -132,42 +174,87 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
         self.corner1.record_toggled.connect(lambda idx, name, state: self._toggle_corner_from_thumb(1, state))
         self.corner2.record_toggled.connect(lambda idx, name, state: self._toggle_corner_from_thumb(2, state))
         self.recording = False
-        self.record_writer = None
+        self.recorder = None
         self.record_file = None
         self.prev_gray = None
+        self._motion_small = None
+        self._motion_gray = None
+        self._motion_diff = None
+        self._motion_mask = None
         self.corner_recording = {1: False, 2: False}
-        self.corner_record_writers = {1: None, 2: None}
+        self.corner_recorders = {1: None, 2: None}
         self.corner_record_files = {1: None, 2: None}
         self.corner_record_fps = {1: 20.0, 2: 20.0}
+        self.corner_record_keys = {1: None, 2: None}
         self.build_ui()
+        self._scanning = False
+        self.cameras_scanned.connect(self._on_cameras_scanned)
+        self._failed_writes: List[str] = []
+        self.capture_write_failed.connect(self._on_capture_write_failed)
+        QTimer.singleShot(0, self._start_camera_scan)
+
+    def _start_camera_scan(self, rescan=False):
+        # Enumerate and open cameras off the GUI thread so the window keeps painting;
+        # refresh_cameras then finds a warm scan cache and already-open captures.
+        if self._scanning:
+            return
+        self._scanning = True
+        self.refresh_btn.setEnabled(False)
+
+        def scan():
+            try:
+                if rescan:
+                    invalidate_scan_cache()
+                self.capture_mgr.open_all(scan_cameras())
+            except Exception:
+                pass
+            self.cameras_scanned.emit()
+
+        threading.Thread(target=scan, daemon=True).start()
+
+    def _on_cameras_scanned(self):
+        self._scanning = False
+        self.refresh_btn.setEnabled(True)
         self.refresh_cameras(open_all=True, apply_saved=True)
 
     @contextlib.contextmanager
     def _paused_streams(self):
         main_active = self.timer.isActive()
-        t1_active = self.corner1.timer.isActive()
-        t2_active = self.corner2.timer.isActive()
+        t1_active = self.corner1.is_streaming()
+        t2_active = self.corner2.is_streaming()
         try:
             self.timer.stop()
-            self.corner1.timer.stop()
-            self.corner2.timer.stop()
+            self.corner1.pause()
+            self.corner2.pause()
             yield
         finally:
             if self.current_cam and main_active and not self.timer.isActive():
-                self.timer.start(30)
-            if self.corner1.cam and t1_active and not self.corner1.timer.isActive():
-                self.corner1.timer.start(100)
-            if self.corner2.cam and t2_active and not self.corner2.timer.isActive():
-                self.corner2.timer.start(100)
+                self.timer.start()
+            if t1_active:
+                self.corner1.resume()
+            if t2_active:
+                self.corner2.resume()
 
     def resizeEvent(self, ev):
+        super().resizeEvent(ev)
+        # Drag-resizes arrive in bursts; lay the overlays out once per 16 ms frame.
+        if self._overlays_sized:
+            self._layout_timer.start()
+        else:
+            self._layout_overlays()
+
+    def _layout_overlays(self):
         try:
             margin = 6
             logo_x = 3
             logo_y = 20
-            self.main_detach_btn.adjustSize()
-            self.main_overlay.adjustSize()
-            self.motion_indicator.adjustSize()
+            if not self._overlays_sized:
+                # Overlay texts never change, so their sizes only need computing once.
+                self.main_detach_btn.adjustSize()
+                self.main_overlay.adjustSize()
+                self.motion_indicator.adjustSize()
+                self._overlays_sized = True
+            self.setUpdatesEnabled(False)
             self.logo_label.move(logo_x, self.height() - self.logo_label.height() - logo_y)
             brand_y = self.height() - max(self.logo_label.height(), self.brand_label.height()) - logo_y + (self.logo_label.height() - self.brand_label.height()) // 2 + 14
             brand_x = self.logo_label.x() + self.logo_label.width() + 2
@@ -185,7 +272,8 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
             self.brand_label.raise_()
         except Exception:
             pass
-        super().resizeEvent(ev)
+        finally:
+            self.setUpdatesEnabled(True)
 
     def mousePressEvent(self, ev):
         if ev.button() == Qt.MouseButton.LeftButton:
@@ -227,6 +315,22 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
         self.motion_indicator.hide()
         self.prev_gray = None
         self.stop_recording()
+        self._release_main_worker()
+
+    def _release_main_worker(self):
+        if self._main_worker is not None:
+            self._main_worker.set_interval(self, None)
+            try:
+                self._main_worker.signals.frame_ready.disconnect(self._on_main_frame)
+            except (TypeError, RuntimeError):
+                pass
+            self._main_worker = None
+        # A new worker numbers its frames from 0 again.
+        self._last_seq = -1
+
+    def _on_main_frame(self):
+        if self.timer.isActive():
+            self.update_frame()
 
     def toggle_motion(self):
         self.motion_enabled = self.motion_btn.isChecked()
@@ -241,15 +345,11 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
         else:
             self.start_recording()
 
-    def _frame_to_rgb(self, frame):
-        try:
-            return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        except Exception:
-            return None
-
     def apply_settings(self):
+        self._smooth = bool(self.settings.get("smooth_scaling"))
+        self.corner1.smooth = self.corner2.smooth = self._smooth
         self.cams = scan_cameras()
-        self.capture_mgr.release_all()
+        self.capture_mgr.prune(self.cams)
         self.capture_mgr.open_all(self.cams)
 
         def find(idx=None, path=None):
@@ -276,19 +376,17 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
             t2 = None
 
         if main:
+            if self.current_cam is not main:
+                self._release_main_worker()
             self.current_cam = main
             self.prev_gray = None
-            cap = self.capture_mgr.get(main["index"] if isinstance(main.get("index"), int) and main.get("index") >= 0 else main.get("path"))
+            cap = self.capture_mgr.get(main)
             if cap and self.settings.get("resolution"):
-                try:
-                    w, h = tuple(self.settings["resolution"])
-                    cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
-                    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
-                except Exception:
-                    pass
+                w, h = tuple(self.settings["resolution"])
+                self.capture_mgr.set_resolution(main, w, h)
             if cap:
                 if not self.timer.isActive():
-                    self.timer.start(30)
+                    self.timer.start()
                 self.main_overlay.show()
                 self.main_detach_btn.show()
                 self.main_capture_btn.show()
@@ -303,26 +401,23 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
             except Exception:
                 pass
 
-        cap_t1 = None
-        cap_t2 = None
+        worker_t1 = None
+        worker_t2 = None
         if t1:
-            cap_t1 = self.capture_mgr.get(t1["index"] if isinstance(t1.get("index"), int) and t1.get("index") >= 0 else t1.get("path"))
+            worker_t1 = self.capture_mgr.worker(t1)
         if t2:
-            cap_t2 = self.capture_mgr.get(t2["index"] if isinstance(t2.get("index"), int) and t2.get("index") >= 0 else t2.get("path"))
+            worker_t2 = self.capture_mgr.worker(t2)
 
         self.corner1.set_title("Corner Cam 1")
         self.corner2.set_title("Corner Cam 2")
 
-        self.corner1.set_camera(t1, cap_t1)
-        self.corner2.set_camera(t2, cap_t2)
+        self.corner1.set_camera(t1, worker_t1.cap if worker_t1 else None, worker_t1)
+        self.corner2.set_camera(t2, worker_t2.cap if worker_t2 else None, worker_t2)
         self.corner1.set_frame_callback(lambda frame: self._record_corner_frame(1, frame))
         self.corner2.set_frame_callback(lambda frame: self._record_corner_frame(2, frame))
         self.corner1.set_recording_active(self.corner_recording.get(1, False))
         self.corner2.set_recording_active(self.corner_recording.get(2, False))
-        if not t1:
-            self.stop_corner_recording(1)
-        if not t2:
-            self.stop_corner_recording(2)
+        self._sync_corner_recorders()
         self._populate_fs_combo()
         self._populate_selectors(main, t1, t2)
         self._ensure_controls_panel()
@@ -333,6 +428,7 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
             QMessageBox.warning(self, "No Cameras", "No cameras detected.")
             self.corner1.set_camera(None, None)
             self.corner2.set_camera(None, None)
+            self._sync_corner_recorders()
             self.capture_mgr.release_all()
             self._set_main_placeholder()
             self._populate_fs_combo()
@@ -356,6 +452,7 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
         self._set_main_placeholder()
         self.corner1.set_camera(None, None)
         self.corner2.set_camera(None, None)
+        self._sync_corner_recorders()
         self._populate_fs_combo()
         self._populate_selectors(None, None, None)
         self._ensure_controls_panel()
@@ -367,41 +464,35 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
     def update_frame(self):
         if not self.current_cam:
             return
-        idx = self.current_cam.get("index")
-        cap = None
-        try:
-            if isinstance(idx, int) and idx >= 0:
-                cap = self.capture_mgr.get(int(idx))
-            else:
-                cap = self.capture_mgr.get(self.current_cam.get("path"))
-        except Exception:
-            cap = None
-        if not cap:
-            if self.recording:
-                self.stop_recording()
-            return
-        try:
-            ret, frame = cap.read()
-        except Exception:
-            ret = False
-            frame = None
-        if not ret or frame is None:
+        worker = self._main_worker
+        if worker is None or not worker.is_alive():
+            # Resolve the handle only when the camera or its worker changed.
+            self._release_main_worker()
+            try:
+                worker = self.capture_mgr.worker(self.current_cam)
+            except Exception:
+                worker = None
+            if not worker:
+                if self.recording:
+                    self.stop_recording()
+                return
+            self._main_worker = worker
+            worker.signals.frame_ready.connect(self._on_main_frame)
+            self._update_decode_rates()
+        seq, frame = worker.fetch()
+        if frame is None or seq == self._last_seq:
             return
+        self._last_seq = seq
         motion = False
         if self.motion_enabled:
             try:
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                gray = cv2.GaussianBlur(gray, (5, 5), 0)
-                if self.prev_gray is not None:
-                    diff = cv2.absdiff(self.prev_gray, gray)
-                    _, thresh = cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)
-                    motion = cv2.countNonZero(thresh) > 5000
-                self.prev_gray = gray
+                motion = self._motion_check(frame)
             except Exception:
                 self.prev_gray = None
                 motion = False
             if motion:
                 try:
+                    frame = frame.copy()
                     cv2.rectangle(frame, (0, 0), (frame.shape[1] - 1, frame.shape[0] - 1), (0, 0, 255), 3)
                 except Exception:
                     pass
@@ -409,52 +500,73 @@ class CameraApp(QWidget, CaptureActionsMixin, FullscreenMixin, PanelMixin, Dialo
             self.prev_gray = None
 
         if self.recording:
-            if not self.record_writer and self.record_file:
-                try:
-                    h, w = frame.shape[:2]
-                    fps = cap.get(cv2.CAP_PROP_FPS) or 20.0
-                    if fps and fps < 1:
-                        fps = 20.0
-                    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                    self.record_writer = cv2.VideoWriter(str(self.record_file), fourcc, fps or 20.0, (w, h))
-                except Exception:
-                    self.stop_recording()
-            if self.record_writer and self.record_writer.isOpened():
-                try:
-                    self.record_writer.write(frame)
-                except Exception:
-                    self.stop_recording()
-            else:
+            if self.recorder is None or not self.recorder.submit(frame):
                 self.stop_recording()
 
-        rgb = self._frame_to_rgb(frame)
-        if rgb is None:
+        if self.isMinimized() or not self.video_label.isVisible():
             return
-        h, w, _ = rgb.shape
-        q = QImage(rgb.data, w, h, 3 * w, QImage.Format.Format_RGB888)
-        p = QPixmap.fromImage(q).scaled(self.video_label.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        self.video_label.setPixmap(p)
-        self.video_label.setText("")
+        w, h = self.video_label.width(), self.video_label.height()
+        worker.set_view(self, w, h, self._smooth)
+        view = None if motion else worker.view(self)[1]
+        try:
+            rendered = self._preview.render_image(frame if view is None else view, w, h, self._smooth)
+        except Exception:
+            rendered = None
+        if rendered is None:
+            return
+        self.video_label.set_image(*rendered)
         if self.motion_enabled:
-            self.motion_indicator.setStyleSheet("background:#d32f2f; color:#fff; padding:3px 6px; border-radius:4px;" if motion else "background:#444; color:#fff; padding:3px 6px; border-radius:4px;")
+            # Re-applying a stylesheet repolishes the label, so only do it on a change.
+            if motion != self._motion_shown:
+                self.motion_indicator.setStyleSheet(MOTION_ON_QSS if motion else MOTION_OFF_QSS)
+                self._motion_shown = motion
             self.motion_indicator.show()
         else:
             self.motion_indicator.hide()
 
+    def _update_decode_rates(self):
+        # A minimized window needs no preview frames; recorders register their own rate.
+        showing = self.isVisible() and not self.isMinimized()
+        if self._main_worker is not None:
+            self._main_worker.set_interval(self, MAIN_DECODE_INTERVAL if showing or self.recording else None)
+        for thumb in (self.corner1, self.corner2):
+            if thumb.worker is not None:
+                thumb.worker.set_interval(thumb, thumb.DECODE_INTERVAL if showing and thumb.isVisible() else None)
+
+    def changeEvent(self, e):
+        if e.type() == QEvent.Type.WindowStateChange:
+            self._update_decode_rates()
+        super().changeEvent(e)
+
+    def _motion_check(self, frame) -> bool:
+        # Every dst/out buffer is allocated on first use and reused after;
+        # the two gray planes ping-pong between prev_gray and _motion_gray.
+        self._motion_small = cv2.resize(frame, MOTION_SIZE, dst=self._motion_small, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(self._motion_small, cv2.COLOR_BGR2GRAY, dst=self._motion_gray)
+        prev, self.prev_gray = self.prev_gray, gray
+        self._motion_gray = prev
+        if prev is None:
+            return False
+        self._motion_diff = cv2.absdiff(prev, gray, dst=self._motion_diff)
+        self._motion_mask = np.greater(self._motion_diff, 25, out=self._motion_mask)
+        # Each MOTION_SIZE cell stands for (w * h) / MOTION_SIZE-area source pixels.
+        h, w = frame.shape[:2]
+        limit = max(1, MOTION_PIXELS * MOTION_SIZE[0] * MOTION_SIZE[1] // (w * h))
+        return np.count_nonzero(self._motion_mask) > limit
+
     def closeEvent(self, e):
         try:
             self.timer.stop()
         except Exception:
             pass
-        try:
-            self.corner1.timer.stop()
-            self.corner2.timer.stop()
-        except Exception:
-            pass
+        self.corner1.pause()
+        self.corner2.pause()
         self.stop_recording()
         self.stop_corner_recording(1)
         self.stop_corner_recording(2)
         self.capture_mgr.release_all()
+        self._save_timer.stop()
+        save_settings(self.settings)
         super().closeEvent(e)
 
     def _logo_press(self, ev):
@@ -5,7 +5,10 @@ from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import QLabel, QMessageBox, QComboBox
 
 from control_panel import build_control_panel
-from dialogs import populate_combo
+from dialogs import cam_key, populate_combo
+
+MOTION_BTN_ON_QSS = "background:#16a34a; color:#fff; padding:10px 14px; border:none; border-radius:8px; font-weight:600;"
+MOTION_BTN_OFF_QSS = "background:#b91c1c; color:#fff; padding:10px 14px; border:none; border-radius:8px; font-weight:600;"
 
 
 class PanelMixin:
@@ -23,11 +26,10 @@ class PanelMixin:
         self.open_fullscreen(idx, name)
 
     def _cam_key(self, cam):
-        if not cam:
-            return None
-        if cam.get("path") is not None:
-            return f"path:{cam['path']}"
-        return f"idx:{cam.get('index')}"
+        return cam_key(cam)
+
+    def _select_key(self, cb: QComboBox, target):
+        cb.setCurrentIndex(getattr(cb, "key_index", {}).get(self._cam_key(target), 0))
 
     def _populate_selectors(self, main, c1, c2):
         self._selectors_updating = True
@@ -39,19 +41,12 @@ class PanelMixin:
                 if self.res_sel.itemData(i) == tuple(self.settings.get("resolution", (640, 480))):
                     self.res_sel.setCurrentIndex(i)
                     break
+            i = self.fmt_sel.findData(self.settings.get("fourcc") or "")
+            self.fmt_sel.setCurrentIndex(i if i >= 0 else 0)
 
-            def set_sel(cb: QComboBox, target):
-                key = self._cam_key(target)
-                for i in range(cb.count()):
-                    data = cb.itemData(i)
-                    if self._cam_key(data) == key:
-                        cb.setCurrentIndex(i)
-                        return
-                cb.setCurrentIndex(0)
-
-            set_sel(self.main_sel, main)
-            set_sel(self.c1_sel, c1)
-            set_sel(self.c2_sel, c2)
+            self._select_key(self.main_sel, main)
+            self._select_key(self.c1_sel, c1)
+            self._select_key(self.c2_sel, c2)
         finally:
             self._selectors_updating = False
 
@@ -71,14 +66,7 @@ class PanelMixin:
                 self._show_in_use_warning()
                 self._selectors_updating = True
                 try:
-                    key = self._cam_key({"index": self.pending_settings.get(slot), "path": self.pending_settings.get(f"{slot}_path")})
-                    for i in range(cb.count()):
-                        data = cb.itemData(i)
-                        if self._cam_key(data) == key:
-                            cb.setCurrentIndex(i)
-                            break
-                    else:
-                        cb.setCurrentIndex(0)
+                    self._select_key(cb, {"index": self.pending_settings.get(slot), "path": self.pending_settings.get(f"{slot}_path")})
                 finally:
                     self._selectors_updating = False
                 return
@@ -95,8 +83,7 @@ class PanelMixin:
         self.save_and_apply()
 
     def save_and_apply(self):
-        from settings_store import save_settings
-        save_settings(self.settings)
+        self._save_timer.start()
         self.apply_settings()
 
     def _apply_resolution_from_panel(self):
@@ -105,6 +92,18 @@ class PanelMixin:
             self.settings["resolution"] = res
             self.save_and_apply()
 
+    def _apply_format_from_panel(self):
+        if self._selectors_updating:
+            return
+        fourcc = self.fmt_sel.currentData() or ""
+        if fourcc == (self.settings.get("fourcc") or ""):
+            return
+        self.settings["fourcc"] = fourcc
+        # The pixel format is negotiated at open time, so reopen every capture.
+        self.capture_mgr.fourcc = fourcc
+        self.capture_mgr.release_all()
+        self.save_and_apply()
+
     def _apply_all_pending(self):
         for slot in ("main", "corner1", "corner2"):
             self.settings[slot] = self.pending_settings.get(slot)
@@ -118,10 +117,7 @@ class PanelMixin:
         self.pending_settings = dict(self.settings)
 
     def _update_motion_button_style(self):
-        if self.motion_enabled:
-            self.motion_btn.setStyleSheet("background:#16a34a; color:#fff; padding:10px 14px; border:none; border-radius:8px; font-weight:600;")
-        else:
-            self.motion_btn.setStyleSheet("background:#b91c1c; color:#fff; padding:10px 14px; border:none; border-radius:8px; font-weight:600;")
+        self.motion_btn.setStyleSheet(MOTION_BTN_ON_QSS if self.motion_enabled else MOTION_BTN_OFF_QSS)
 
     def _hide_controls_panel_for_dialog(self):
         self._panel_was_visible = self.controls_panel and self.controls_panel.isVisible()
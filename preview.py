@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+from PyQt6 import sip
+from PyQt6.QtGui import QImage
+
+
+def fit_size(w: int, h: int, box_w: int, box_h: int) -> Tuple[int, int]:
+    scale = min(box_w / w, box_h / h)
+    return max(1, int(w * scale)), max(1, int(h * scale))
+
+
+def scale_interpolation(src_w: int, dst_w: int, smooth: bool = True) -> int:
+    if not smooth:
+        return cv2.INTER_NEAREST
+    return cv2.INTER_AREA if dst_w < src_w else cv2.INTER_LINEAR
+
+
+class PreviewBuffer:
+    def __init__(self):
+        self._buf: Optional[np.ndarray] = None
+        self._image: Optional[QImage] = None
+        self._key = None
+        self._size = (0, 0)
+        self._interp = cv2.INTER_AREA
+
+    def render_image(self, frame, box_w: int, box_h: int, smooth: bool = True) -> Optional[Tuple[QImage, np.ndarray]]:
+        """Resize frame into the persistent buffer; return the QImage over it and that buffer."""
+        if box_w < 2 or box_h < 2:
+            return None
+        h, w = frame.shape[:2]
+        key = (w, h, box_w, box_h, smooth)
+        if key != self._key:
+            tw, th = fit_size(w, h, box_w, box_h)
+            self._buf = np.empty((th, tw, 3), dtype=np.uint8)
+            ptr = sip.voidptr(self._buf.ctypes.data)
+            ptr.setsize(self._buf.nbytes)
+            self._image = QImage(ptr, tw, th, self._buf.strides[0], QImage.Format.Format_BGR888)
+            self._size = (tw, th)
+            self._interp = scale_interpolation(w, tw, smooth)
+            self._key = key
+        cv2.resize(frame, self._size, dst=self._buf, interpolation=self._interp)
+        return self._image, self._buf
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+import functools
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+_hw_writer_broken = False
+_named_encoder_ready = False
+WRITER_OPTIONS_ENV = "OPENCV_FFMPEG_WRITER_OPTIONS"
+
+# Encoders OpenCV can reach through VIDEOWRITER_PROP_HW_ACCELERATION, then
+# ones that have to be named explicitly through the FFmpeg writer options.
+HW_ACCEL_ENCODERS = ("h264_nvenc", "h264_vaapi", "h264_qsv")
+NAMED_ENCODERS = ("h264_v4l2m2m",)
+
+
+@functools.lru_cache(maxsize=1)
+def hw_encoder() -> Optional[str]:
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return None
+    try:
+        out = subprocess.run([ffmpeg, "-hide_banner", "-encoders"], capture_output=True, text=True, timeout=5).stdout
+    except Exception:
+        return None
+    if hasattr(cv2, "VIDEOWRITER_PROP_HW_ACCELERATION"):
+        for name in HW_ACCEL_ENCODERS:
+            if name in out:
+                return name
+    for name in NAMED_ENCODERS:
+        if name in out:
+            return name
+    return None
+
+
+def _probe_writer() -> bool:
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            writer = cv2.VideoWriter(str(Path(tmp) / "probe.mp4"), cv2.CAP_FFMPEG, cv2.VideoWriter_fourcc(*"avc1"), 10.0, (320, 240))
+            ok = writer.isOpened()
+            if ok:
+                writer.write(np.zeros((240, 320, 3), dtype=np.uint8))
+            writer.release()
+            return ok
+        except Exception:
+            return False
+
+
+def configure_hw_encoder():
+    """Pick the hardware encoder once at startup, before any capture thread exists."""
+    # Encoders named through the FFmpeg writer options need a process-wide env var;
+    # set it only here, keep it only if a probe writer opens, never touch it later.
+    global _hw_writer_broken, _named_encoder_ready
+    encoder = hw_encoder()
+    if encoder not in NAMED_ENCODERS:
+        return
+    if WRITER_OPTIONS_ENV in os.environ:
+        # Respect options the user set; they decide what the FFmpeg writer does.
+        _named_encoder_ready = True
+        return
+    os.environ[WRITER_OPTIONS_ENV] = f"video_codec;{encoder}"
+    if _probe_writer():
+        _named_encoder_ready = True
+    else:
+        del os.environ[WRITER_OPTIONS_ENV]
+        _hw_writer_broken = True
+
+
+def _open_hw_writer(encoder: str, path: Union[str, Path], fps: float, size: Tuple[int, int]) -> cv2.VideoWriter:
+    fourcc = cv2.VideoWriter_fourcc(*"avc1")
+    if encoder in HW_ACCEL_ENCODERS:
+        return cv2.VideoWriter(
+            str(path), cv2.CAP_FFMPEG, fourcc, fps, size,
+            [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+        )
+    return cv2.VideoWriter(str(path), cv2.CAP_FFMPEG, fourcc, fps, size)
+
+
+def make_writer(path: Union[str, Path], fps: float, size: Tuple[int, int]) -> cv2.VideoWriter:
+    global _hw_writer_broken
+    encoder = None if _hw_writer_broken else hw_encoder()
+    if encoder in NAMED_ENCODERS and not _named_encoder_ready:
+        # configure_hw_encoder() did not run, and the environment is off limits now.
+        encoder = None
+    if encoder:
+        try:
+            writer = _open_hw_writer(encoder, path, fps, size)
+            if writer.isOpened():
+                return writer
+            writer.release()
+        except Exception:
+            pass
+        _hw_writer_broken = True
+    return cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+
+
+def fit_within(w: int, h: int, limit: Optional[Tuple[int, int]]) -> Tuple[int, int]:
+    if not limit or (w <= limit[0] and h <= limit[1]):
+        return (w, h)
+    scale = min(limit[0] / w, limit[1] / h)
+    return (max(2, int(w * scale) & ~1), max(2, int(h * scale) & ~1))
+
+
+class FrameRecorder(threading.Thread):
+    def __init__(self, path: Union[str, Path], fps: float, max_size: Optional[Tuple[int, int]] = None, maxsize: int = 8):
+        super().__init__(daemon=True)
+        self.path = Path(path)
+        self.fps = fps or 20.0
+        self.max_size = tuple(max_size) if max_size else None
+        self.size: Optional[Tuple[int, int]] = None
+        self.failed = False
+        self.dropped = 0
+        self._maxsize = maxsize
+        self._allocated = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize + 1)
+        self._free: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._stopped = False
+        self.source = None
+        self.source_lost = False
+        self._on_source_stopped = None
+
+    def attach(self, worker):
+        """Record every frame worker decodes, straight from its capture thread."""
+        self.detach()
+        self.source = worker
+        self.source_lost = False
+        worker.set_interval(self, 0.9 / self.fps)
+        worker.add_sink(self, self.submit)
+        self._on_source_stopped = lambda: self._source_stopped(worker)
+        worker.signals.stopped.connect(self._on_source_stopped)
+
+    def detach(self):
+        source, self.source = self.source, None
+        if source is None:
+            return
+        try:
+            source.signals.stopped.disconnect(self._on_source_stopped)
+        except (TypeError, RuntimeError):
+            pass
+        self._on_source_stopped = None
+        source.remove_sink(self)
+        source.set_interval(self, None)
+
+    def _source_stopped(self, worker):
+        # The signal may arrive queued, after a re-attach; only the current source counts.
+        if worker is self.source:
+            self.source_lost = True
+
+    def _buffer(self, frame) -> Optional[np.ndarray]:
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            pass
+        if self._allocated >= self._maxsize:
+            # Writer is behind: drop the oldest queued frame and reuse its buffer.
+            try:
+                buf = self._queue.get_nowait()
+            except queue.Empty:
+                return None
+            if buf is None:
+                self._queue.put_nowait(None)
+                return None
+            self.dropped += 1
+            return buf
+        self._allocated += 1
+        w, h = self.size
+        return np.empty((h, w, 3), dtype=np.uint8)
+
+    def submit(self, frame) -> bool:
+        if self.failed or self._stopped:
+            return False
+        if self.size is None:
+            h, w = frame.shape[:2]
+            self.size = fit_within(w, h, self.max_size)
+        buf = self._buffer(frame)
+        if buf is None:
+            self.dropped += 1
+            return True
+        try:
+            if frame.shape[1::-1] == self.size:
+                np.copyto(buf, frame)
+            else:
+                cv2.resize(frame, self.size, dst=buf, interpolation=cv2.INTER_AREA)
+        except Exception:
+            self._free.put(buf)
+            return True
+        self._queue.put_nowait(buf)
+        return True
+
+    def run(self):
+        writer = None
+        while True:
+            buf = self._queue.get()
+            if buf is None:
+                break
+            if writer is None and not self.failed:
+                try:
+                    writer = make_writer(self.path, self.fps, self.size)
+                    if not writer or not writer.isOpened():
+                        writer = None
+                        self.failed = True
+                except Exception:
+                    writer = None
+                    self.failed = True
+            if writer is not None:
+                try:
+                    writer.write(buf)
+                except Exception:
+                    self.failed = True
+            self._free.put(buf)
+        if writer is not None:
+            try:
+                writer.release()
+            except Exception:
+                pass
+
+    def stop(self, timeout: float = 5.0):
+        self.detach()
+        self._stopped = True
+        self._queue.put(None)
+        if self.is_alive():
+            self.join(timeout=timeout)
@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
 import json
+import os
 import platform
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 import cv2
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DEFAULT_SETTINGS: Dict[str, Any] = {
     "main": None,
     "main_path": None,
@@ -14,18 +20,39 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
     "corner2": None,
     "corner2_path": None,
     "resolution": (640, 480),
+    "fourcc": "MJPG",
+    "camera_fourcc": {},
+    "smooth_scaling": False,
+    "corner_record_size": (640, 360),
 }
 
 IS_LINUX = platform.system().lower() == "linux"
 CAP_BACKEND = cv2.CAP_V4L2 if IS_LINUX else cv2.CAP_ANY
 SETTINGS_FILE = Path(__file__).with_name("settings.json")
 
+_saved_bytes: Optional[bytes] = None
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, indent=2).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def load_settings() -> Dict[str, Any]:
+    global _saved_bytes
     data = dict(DEFAULT_SETTINGS)
     try:
         if SETTINGS_FILE.exists():
-            raw = json.loads(SETTINGS_FILE.read_text(encoding="utf-8"))
+            blob = SETTINGS_FILE.read_bytes()
+            _saved_bytes = blob
+            raw = _loads(blob)
             if isinstance(raw, dict):
                 for k in data:
                     if k in raw:
@@ -38,10 +65,17 @@ def load_settings() -> Dict[str, Any]:
 
 
 def save_settings(settings: Dict[str, Any]) -> None:
+    global _saved_bytes
     try:
         payload = {k: settings.get(k) for k in DEFAULT_SETTINGS}
         if payload.get("resolution"):
             payload["resolution"] = list(payload["resolution"])
-        SETTINGS_FILE.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        blob = _dumps(payload)
+        if blob == _saved_bytes:
+            return
+        tmp = SETTINGS_FILE.with_suffix(".json.tmp")
+        tmp.write_bytes(blob)
+        os.replace(tmp, SETTINGS_FILE)
+        _saved_bytes = blob
     except Exception:
         pass
@@ -1,13 +1,55 @@
 #!/usr/bin/env python3
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
-import cv2
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
-from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QPainter, QPixmap
 from PyQt6.QtWidgets import QFrame, QLabel, QPushButton, QVBoxLayout
 
+from preview import PreviewBuffer
+
+DETACH_BTN_QSS = "QPushButton{background:#1e88e5;color:#fff;border:none;border-radius:3px;} QPushButton:pressed{background:#166bb0;}"
+CAPTURE_BTN_QSS = "QPushButton{background:#0ea5e9;color:#fff;border:none;border-radius:3px;} QPushButton:pressed{background:#0284c7;}"
+RECORD_BTN_QSS = "QPushButton{background:#16a34a;color:#fff;border:none;border-radius:3px;} QPushButton:pressed{background:#15803d;} QPushButton:checked{background:#b91c1c;}"
+THUMB_FRAME_QSS = "background:qlineargradient(x1:0,y1:0,x2:1,y2:1,stop:0 #0f172a, stop:1 #111827);color:#e6eef8;border:1px solid #1f2937;border-radius:8px;"
+THUMB_LABEL_QSS = "color:#e6eef8; font-size:14px;"
+THUMB_OVERLAY_QSS = "background: rgba(0,0,0,0.6); color: #fff; padding: 3px 6px; border-radius:4px;"
+
+
+class VideoView(QLabel):
+    """QLabel that paints a frame QImage directly, skipping the QPixmap conversion."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._image: Optional[QImage] = None
+        self._pinned = None
+
+    def set_image(self, image: Optional[QImage], buf=None):
+        """Paint image from now on; buf is the memory it wraps, held for as long as the image."""
+        if self.text():
+            super().setText("")
+        self._image, self._pinned = image, buf
+        self.update()
+
+    def setPixmap(self, pixmap):
+        self._image = self._pinned = None
+        super().setPixmap(pixmap)
+
+    def setText(self, text):
+        self._image = self._pinned = None
+        super().setText(text)
+
+    def paintEvent(self, ev):
+        super().paintEvent(ev)
+        image = self._image
+        if image is None:
+            return
+        painter = QPainter(self)
+        painter.drawImage((self.width() - image.width()) // 2, (self.height() - image.height()) // 2, image)
+        painter.end()
+
 
 class CameraThumbnail(QFrame):
+    DECODE_INTERVAL = 0.08
     clicked = pyqtSignal(int, str)
     detach_requested = pyqtSignal(int, str)
     capture_requested = pyqtSignal(int, str)
@@ -15,172 +57,210 @@ class CameraThumbnail(QFrame):
 
     def __init__(self, title: str = "Corner Cam", min_w=320, min_h=240):
         super().__init__()
-        self.setStyleSheet("background:qlineargradient(x1:0,y1:0,x2:1,y2:1,stop:0 #0f172a, stop:1 #111827);color:#e6eef8;border:1px solid #1f2937;border-radius:8px;")
+        self.setStyleSheet(THUMB_FRAME_QSS)
         self.setMinimumSize(min_w, min_h)
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
-        self.label = QLabel("No camera selected")
+        self.label = VideoView("No camera selected")
         self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.label.setStyleSheet("color:#e6eef8; font-size:14px;")
+        self.label.setStyleSheet(THUMB_LABEL_QSS)
         self.layout.addWidget(self.label)
         self.overlay = QLabel(title, self)
-        self.overlay.setStyleSheet("background: rgba(0,0,0,0.6); color: #fff; padding: 3px 6px; border-radius:4px;")
+        self.overlay.setStyleSheet(THUMB_OVERLAY_QSS)
         self.overlay.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
         self.overlay.hide()
         self.detach_btn = QPushButton("Separate Window", self)
         self.detach_btn.setMinimumHeight(28)
         self.detach_btn.setMinimumWidth(190)
-        self.detach_btn.setStyleSheet("QPushButton{background:#1e88e5;color:#fff;border:none;border-radius:3px;} QPushButton:pressed{background:#166bb0;}")
+        self.detach_btn.setStyleSheet(DETACH_BTN_QSS)
         self.detach_btn.clicked.connect(self._detach)
         self.detach_btn.hide()
         self.capture_btn = QPushButton("Take Picture", self)
         self.capture_btn.setMinimumHeight(28)
         self.capture_btn.setMinimumWidth(160)
-        self.capture_btn.setStyleSheet("QPushButton{background:#0ea5e9;color:#fff;border:none;border-radius:3px;} QPushButton:pressed{background:#0284c7;}")
+        self.capture_btn.setStyleSheet(CAPTURE_BTN_QSS)
         self.capture_btn.clicked.connect(self._capture)
         self.capture_btn.hide()
         self.record_btn = QPushButton("Start Recording", self)
         self.record_btn.setCheckable(True)
         self.record_btn.setMinimumHeight(28)
         self.record_btn.setMinimumWidth(160)
-        self.record_btn.setStyleSheet("QPushButton{background:#16a34a;color:#fff;border:none;border-radius:3px;} QPushButton:pressed{background:#15803d;} QPushButton:checked{background:#b91c1c;}")
+        self.record_btn.setStyleSheet(RECORD_BTN_QSS)
         self.record_btn.clicked.connect(self._record_toggle)
         self.record_btn.hide()
+        self._controls = (self.overlay, self.detach_btn, self.capture_btn, self.record_btn)
         self.cam: Optional[Dict[str, Any]] = None
+        self._cam_idx = -1
+        self._cam_name = ""
         self.cap = None
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._tick)
+        self.worker = None
+        self._last_seq = -1
+        self._preview = PreviewBuffer()
+        self.smooth = False
+        self._streaming = False
         self.frame_callback = None
+        self._btn_ys: Optional[Tuple[int, int, int]] = None
 
     def resizeEvent(self, ev):
+        ys = self._btn_ys
+        if ys is None:
+            # The button stack only depends on child heights; cache it once they are polished.
+            detach_y = self.overlay.height() + 12
+            capture_y = detach_y + self.detach_btn.height() + 6
+            ys = (detach_y, capture_y, capture_y + self.capture_btn.height() + 6)
+            if self.isVisible():
+                self._btn_ys = ys
+        self.setUpdatesEnabled(False)
         try:
             self.overlay.move(8, 8)
-            self.detach_btn.move(8, self.overlay.height() + 12)
-            self.capture_btn.move(8, self.detach_btn.y() + self.detach_btn.height() + 6)
-            self.record_btn.move(8, self.capture_btn.y() + self.capture_btn.height() + 6)
+            self.detach_btn.move(8, ys[0])
+            self.capture_btn.move(8, ys[1])
+            self.record_btn.move(8, ys[2])
         except Exception:
             pass
+        finally:
+            self.setUpdatesEnabled(True)
         super().resizeEvent(ev)
 
+    def showEvent(self, ev):
+        super().showEvent(ev)
+        # Spontaneous show/hide comes from the window being minimized or restored,
+        # which the main window already handles for every thumbnail.
+        if not ev.spontaneous() and self.worker is not None:
+            self.worker.set_interval(self, self.DECODE_INTERVAL)
+            if self._streaming:
+                self._tick()
+
+    def hideEvent(self, ev):
+        super().hideEvent(ev)
+        if not ev.spontaneous() and self.worker is not None:
+            self.worker.set_interval(self, None)
+
     def set_title(self, text: str):
         self.overlay.setText(text)
+        self._btn_ys = None
+
+    def is_streaming(self) -> bool:
+        return self._streaming
 
-    def set_camera(self, cam, cap):
+    def pause(self):
+        if not self._streaming:
+            return
+        self._streaming = False
         try:
-            self.timer.stop()
-        except Exception:
+            self.worker.signals.frame_ready.disconnect(self._tick)
+        except (TypeError, RuntimeError):
             pass
-        self.cam, self.cap = cam, cap
+
+    def resume(self):
+        if self._streaming or not self.cam or self.worker is None:
+            return
+        self.worker.signals.frame_ready.connect(self._tick)
+        self._streaming = True
+        self._tick()
+
+    def set_camera(self, cam, cap, worker=None):
+        self.pause()
+        if self.worker is not None and self.worker is not worker:
+            self.worker.set_interval(self, None)
+        self.cam, self.cap, self.worker = cam, cap, worker
+        self._cam_idx, self._cam_name = -1, ""
+        if cam:
+            try:
+                self._cam_idx = int(cam.get("index", -1))
+            except Exception:
+                pass
+            self._cam_name = cam.get("name", "Camera")
+        if worker is not None:
+            worker.set_interval(self, self.DECODE_INTERVAL if self.isVisible() else None)
+        self._last_seq = -1
         self.frame_callback = None
         if not cam or not cap:
-            self.label.setPixmap(QPixmap())
-            self.label.setText("No camera selected")
-            self.label.show()
-            self.overlay.hide()
-            self.detach_btn.hide()
-            self.capture_btn.hide()
-            self.record_btn.hide()
-            self.record_btn.setChecked(False)
-            self.record_btn.setText("Start Recording")
-            self.label.repaint()
+            self._show_no_cam("No camera selected")
             return
         try:
-            if not cap.isOpened():
-                self.label.setText("Camera unavailable.")
-                self.label.show()
-                self.overlay.hide()
-                self.detach_btn.hide()
-                self.capture_btn.hide()
-                self.record_btn.hide()
-                self.record_btn.setChecked(False)
-                self.record_btn.setText("Start Recording")
-                self.label.repaint()
-                return
+            opened = cap.isOpened()
         except Exception:
-            self.label.setText("Camera unavailable.")
+            opened = False
+        if not opened:
+            self._show_no_cam("Camera unavailable.")
+            return
+        self._show_cam()
+        self.resume()
+
+    # Both states toggle the children with updates off so a switch paints once.
+    def _show_cam(self):
+        self.setUpdatesEnabled(False)
+        try:
+            self.label.show()
+            for w in self._controls:
+                w.show()
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _show_no_cam(self, text: str):
+        self.setUpdatesEnabled(False)
+        try:
+            self.label.setPixmap(QPixmap())
+            self.label.setText(text)
             self.label.show()
-            self.overlay.hide()
-            self.detach_btn.hide()
-            self.capture_btn.hide()
-            self.record_btn.hide()
+            for w in self._controls:
+                w.hide()
             self.record_btn.setChecked(False)
             self.record_btn.setText("Start Recording")
-            self.label.repaint()
-            return
-        self.label.show()
-        self.overlay.show()
-        self.detach_btn.show()
-        self.capture_btn.show()
-        self.record_btn.show()
-        self.timer.start(100)
+        finally:
+            self.setUpdatesEnabled(True)
 
     def set_frame_callback(self, cb):
+        """cb gets the capture worker's latest frame uncopied; it must not modify it and should copy anything it keeps."""
         self.frame_callback = cb
 
     def mousePressEvent(self, e):
         if self.cam:
-            try:
-                idx = int(self.cam.get("index", -1))
-            except Exception:
-                idx = -1
-            self.clicked.emit(idx, self.cam.get("name", "Camera"))
+            self.clicked.emit(self._cam_idx, self._cam_name)
 
     def _detach(self):
-        if not self.cam:
-            return
-        try:
-            idx = int(self.cam.get("index", -1))
-        except Exception:
-            idx = -1
-        self.detach_requested.emit(idx, self.cam.get("name", "Camera"))
+        if self.cam:
+            self.detach_requested.emit(self._cam_idx, self._cam_name)
 
     def _capture(self):
-        if not self.cam:
-            return
-        try:
-            idx = int(self.cam.get("index", -1))
-        except Exception:
-            idx = -1
-        self.capture_requested.emit(idx, self.cam.get("name", "Camera"))
+        if self.cam:
+            self.capture_requested.emit(self._cam_idx, self._cam_name)
 
     def _record_toggle(self, state):
         if not self.cam:
             self.record_btn.setChecked(False)
             self.record_btn.setText("Start Recording")
             return
-        try:
-            idx = int(self.cam.get("index", -1))
-        except Exception:
-            idx = -1
-        self.record_toggled.emit(idx, self.cam.get("name", "Camera"), state)
+        self.record_toggled.emit(self._cam_idx, self._cam_name, state)
 
     def set_recording_active(self, active: bool):
         self.record_btn.setChecked(active)
         self.record_btn.setText("Stop Recording" if active else "Start Recording")
 
     def _tick(self):
-        if not self.cap:
+        if not self.worker or not self.isVisible():
             return
-        try:
-            ret, frame = self.cap.read()
-        except Exception:
-            ret = False
-            frame = None
-        if not ret or frame is None:
+        seq, frame = self.worker.fetch()
+        if frame is None:
             self.label.setPixmap(QPixmap())
             self.label.setText("No camera selected")
             self.label.show()
             return
+        if seq == self._last_seq:
+            return
+        self._last_seq = seq
         if self.frame_callback:
             try:
-                self.frame_callback(frame.copy())
+                self.frame_callback(frame)
             except Exception:
                 pass
+        w, h = self.label.width(), self.label.height()
+        self.worker.set_view(self, w, h, self.smooth)
+        _, view = self.worker.view(self)
         try:
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            rendered = self._preview.render_image(frame if view is None else view, w, h, self.smooth)
         except Exception:
             return
-        h, w, _ = rgb.shape
-        q = QImage(rgb.data, w, h, 3 * w, QImage.Format.Format_RGB888)
-        p = QPixmap.fromImage(q).scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        self.label.setPixmap(p)
+        if rendered is not None:
+            self.label.set_image(*rendered)